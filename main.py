@@ -1,8 +1,74 @@
 from src.Simulation.solver import Solver
 import argparse
-import toml
+import copy
+import functools
+import multiprocessing
 import os
 import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from numba import set_num_threads
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+
+@functools.lru_cache(maxsize=256)
+def _read_toml_cached(filename, mtime, size):
+    """
+    Parses and validates a TOML configuration file, remembering the result.
+
+    Used by TomlProcessor.read_toml_file, which passes the file's modification time and size
+    so the cached entry is dropped as soon as the file changes. Callers must not modify
+    the returned dictionary.
+
+    Parameters:
+        filename (str): Path to the TOML file.
+        mtime (int): Modification time of the file in nanoseconds.
+        size (int): Size of the file in bytes.
+
+    Returns:
+        dict: Parsed configuration data.
+
+    Raises:
+        ValueError: If the TOML file is invalid or missing required keys.
+    """
+    required_structure = {
+        "settings": ["nSteps", "tStart", "tEnd"],
+        "geometry": ["meshName", "borders"],
+        "IO": ["logName", "restartFile"]
+    }
+
+    try:
+        with open(filename, "rb") as file:
+            config = tomllib.load(file)
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Error while reading {filename}: {e}")
+
+    for section, keys in required_structure.items():
+        if section not in config:
+            raise ValueError(f"Missing section: '{section}' in {filename}")
+        for key in keys:
+            if key not in config[section]:
+                raise ValueError(f"Missing key: '{section}.{key}' in {filename}")
+
+    # Validate and adjust `nSteps`
+    nSteps = config["settings"].get("nSteps", 0)
+    if nSteps < 100:
+        print(f"Warning: 'nSteps' in {filename} is too low ({nSteps}), simulation may be inaccurate.")
+        logging.info(f"'nSteps' in {filename} is too low ({nSteps}), simulation may be inaccurate.")
+    elif nSteps > 500:
+        print(f"Warning: 'nSteps' in {filename} exceeds the limit ({nSteps}), simulation takes too long. Adjusting to 500.")
+        logging.info(f"'nSteps' in {filename} exceeds the limit ({nSteps}), simulation takes too long. Adjusting to 500.")
+        config["settings"]["nSteps"] = 500
+
+    config["IO"]["writeFrequency"] = config["IO"].get("writeFrequency", -1)
+    if not config["IO"].get("logName"):
+        config["IO"]["logName"] = "logfile"
+
+    return config
 
 
 class TomlProcessor:
@@ -18,10 +84,9 @@ class TomlProcessor:
         """
         Initializes the TomlProcessor.
 
-        Ensures the logs directory exists for storing log files.
+        The logs directory is only created once logging is set up.
         """
         self.log_dir = "logs"
-        os.makedirs(self.log_dir, exist_ok=True)
 
     def setup_logging(self, config=None):
         """
@@ -36,6 +101,7 @@ class TomlProcessor:
         if config:
             log_name = config.get("IO", {}).get("logName", log_name)
 
+        os.makedirs(self.log_dir, exist_ok=True)
         log_file = os.path.join(self.log_dir, f"{log_name}.log")
         logging.basicConfig(
             level=logging.INFO,
@@ -60,40 +126,10 @@ class TomlProcessor:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"File {filename} does not exist")
 
-        required_structure = {
-            "settings": ["nSteps", "tStart", "tEnd"],
-            "geometry": ["meshName", "borders"],
-            "IO": ["logName", "restartFile"]
-        }
-
-        try:
-            with open(filename, "r") as file:
-                config = toml.load(file)
-        except toml.TOMLDecodeError as e:
-            raise ValueError(f"Error while reading {filename}: {e}")
-
-        for section, keys in required_structure.items():
-            if section not in config:
-                raise ValueError(f"Missing section: '{section}' in {filename}")
-            for key in keys:
-                if key not in config[section]:
-                    raise ValueError(f"Missing key: '{section}.{key}' in {filename}")
-
-        # Validate and adjust `nSteps`
-        nSteps = config["settings"].get("nSteps", 0)
-        if nSteps < 100:
-            print(f"Warning: 'nSteps' in {filename} is too low ({nSteps}), simulation may be inaccurate.")
-            logging.info(f"'nSteps' in {filename} is too low ({nSteps}), simulation may be inaccurate.")
-        elif nSteps > 500:
-            print(f"Warning: 'nSteps' in {filename} exceeds the limit ({nSteps}), simulation takes too long. Adjusting to 500.")
-            logging.info(f"'nSteps' in {filename} exceeds the limit ({nSteps}), simulation takes too long. Adjusting to 500.")
-            config["settings"]["nSteps"] = 500
-
-        config["IO"]["writeFrequency"] = config["IO"].get("writeFrequency", -1)
-        if not config["IO"].get("logName"):
-            config["IO"]["logName"] = "logfile"
-
-        return config
+        stat = os.stat(filename)
+        # Memoized per process; a changed mtime or size gives a new key and a fresh read.
+        config = _read_toml_cached(filename, stat.st_mtime_ns, stat.st_size)
+        return copy.deepcopy(config)
       
     def process_single_file(self, file_path):
         """
@@ -141,10 +177,95 @@ class TomlProcessor:
             return
 
         print(f"Found {len(toml_files)} TOML file(s) in folder '{folder}'.")
-        for idx, tom_file in enumerate(toml_files, start=1):
-            file_path = os.path.join(folder, tom_file)
-            print(f"[{idx}/{len(toml_files)}] Processing {tom_file}...")
-            self.process_single_file(file_path)
+        file_paths = [os.path.join(folder, f) for f in toml_files]
+
+        # A restart reads the results of the run whose config it names, so it waits for that
+        # run only. Runs whose restart folder is not produced in this batch start right away.
+        producers = {os.path.normpath(self._result_folder(path)): path for path in file_paths}
+        waiting = {}  # producer file path -> restarts waiting for it
+        ready = []
+        for file_path in file_paths:
+            producer = producers.get(os.path.normpath(self._restart_file(file_path) or ""))
+            if producer is not None and producer != file_path:
+                waiting.setdefault(producer, []).append(file_path)
+            else:
+                ready.append(file_path)
+
+        # Each simulation is independent, so they run in separate processes. Log records
+        # from the workers are sent back through a queue and written by this process.
+        context = multiprocessing.get_context("spawn")
+        log_queue = context.Queue()
+        listener = QueueListener(log_queue, *logging.getLogger().handlers)
+        listener.start()
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context,
+                                     initializer=_init_worker_logging, initargs=(log_queue,)) as executor:
+                running = {executor.submit(self.process_single_file, path): path for path in ready}
+                idx = 0
+                while running or waiting:
+                    if not running:
+                        # Only restarts waiting on each other are left; run them as they are
+                        producer = next(iter(waiting))
+                        running = {executor.submit(self.process_single_file, path): path
+                                   for path in waiting.pop(producer)}
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path = running.pop(future)
+                        idx += 1
+                        print(f"[{idx}/{len(toml_files)}] Finished {os.path.basename(file_path)}")
+                        # The restart folder of this run now exists, so its restarts can start
+                        for restart in waiting.pop(file_path, []):
+                            running[executor.submit(self.process_single_file, restart)] = restart
+        finally:
+            listener.stop()
+
+    def _result_folder(self, file_path, output_folder="result_folder"):
+        """
+        Returns the folder that Solver.save_state writes for a TOML file.
+
+        Parameters:
+            file_path (str): Path to the TOML file.
+            output_folder (str): Folder holding the results of all runs.
+
+        Returns:
+            str: Path of the result folder, named after the configuration file.
+        """
+        return os.path.join(output_folder, os.path.splitext(os.path.basename(file_path))[0])
+
+    def _restart_file(self, file_path):
+        """
+        Reads only IO.restartFile from a TOML file, without the full validation.
+
+        Parameters:
+            file_path (str): Path to the TOML file.
+
+        Returns:
+            str or None: The restart folder, or None if the file sets none or cannot be read.
+            Unreadable files are reported later by process_single_file.
+        """
+        try:
+            with open(file_path, "rb") as file:
+                restart_file = tomllib.load(file)["IO"]["restartFile"]
+        except (KeyError, OSError, tomllib.TOMLDecodeError):
+            return None
+        return restart_file if isinstance(restart_file, str) and restart_file else None
+
+
+def _init_worker_logging(log_queue):
+    """
+    Routes all logging in a worker process to the parent's queue.
+
+    Each worker also runs the compiled kernels on a single thread: the pool already uses
+    one process per core, so more threads per worker would only oversubscribe the cores.
+
+    Parameters:
+        log_queue (multiprocessing.Queue): Queue read by the parent's QueueListener.
+    """
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    set_num_threads(1)
 
 
 def parse_input():
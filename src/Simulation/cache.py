@@ -0,0 +1,62 @@
+import hashlib
+import logging
+import os
+import pickle
+
+# Kept at the project root, so runs started from any directory share one cache.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache")
+
+# Bump this whenever the layout of cached objects changes, so stale entries are ignored.
+CACHE_VERSION = 5
+
+# Module logger: unlike logging.info, it does not install a default root handler when this runs
+# before the application has set up logging.
+logger = logging.getLogger(__name__)
+
+
+def cached(kind, filename, build):
+    """
+    Returns the object built from a file, reusing a pickled copy when the file is unchanged.
+
+    The cache entry is keyed by the SHA-256 of the file contents and CACHE_VERSION,
+    so editing the file (or the cached layout) automatically invalidates it. Only data
+    read from the file should be cached; anything computed from it by other code would
+    go stale when that code changes. Writing the cache is best effort.
+
+    Parameters:
+    - kind (str): Prefix for the cache file name (e.g., "mesh").
+    - filename (str): Path to the source file.
+    - build (callable): Called without arguments to build the object on a cache miss.
+
+    Returns:
+    - The cached or freshly built object.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        # Hash in chunks so large mesh files are never held in memory twice.
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(str(CACHE_VERSION).encode())
+    cache_file = os.path.join(CACHE_DIR, f"{kind}_{digest.hexdigest()}.pkl")
+
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as file:
+                logger.info(f"Loaded {filename} from cache {cache_file}")
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable cache file {cache_file}: {e}")
+
+    value = build()
+
+    # Write to a temporary file first so concurrent runs never see a partial entry.
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_file, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        # A read-only working directory only costs the speed-up, not the simulation
+        logger.warning(f"Could not write cache file {cache_file}: {e}")
+    return value
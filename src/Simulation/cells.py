@@ -1,7 +1,12 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from numba import njit, prange
 import logging
 
+# Integer tags used for the cell type in the mesh arrays (see Mesh.type_tags)
+TRIANGLE, LINE = 0, 1
+CELL_TYPE_TAGS = {"triangle": TRIANGLE, "line": LINE}
+
 
 class CellFactory:
     """
@@ -23,7 +28,7 @@ class CellFactory:
         self._cell_types[key] = cell_class
         logging.info(f"Registered cell type: {key}")
 
-    def __call__(self, key, point_ids, idx, points):
+    def __call__(self, key, point_ids, idx, points, **kwargs):
         """
         Instantiates a cell of the requested type.
 
@@ -32,34 +37,191 @@ class CellFactory:
         - point_ids (list): Indices of the cell's vertices in the mesh.
         - idx (int): Unique index for the cell.
         - points (ndarray): Coordinates of the cell's vertices.
+        - kwargs: Extra arguments passed on to the cell class (e.g., precomputed geometry).
 
         Returns:
         - A new instance of the cell class corresponding to the given key.
         """
-        logging.info(f"Creating cell of type {key} with index {idx}.")
-        return self._cell_types[key](point_ids, idx, points)
+        return self._cell_types[key](point_ids, idx, points, **kwargs)
+
+
+def velocity_field(midpoints):
+    """
+    Defines a velocity field that depends on midpoint coordinates,
+    useful for simulating flow behavior in 2D.
+
+    Parameters:
+    - midpoints (ndarray): Cell midpoints of shape (N, 2).
+
+    Returns:
+    - ndarray: Velocities of shape (N, 3), with a zero z-component.
+    """
+    midpoints = np.asarray(midpoints)
+    velocities = np.zeros((midpoints.shape[0], 3))
+    velocities[:, 0] = midpoints[:, 1] - 0.2 * midpoints[:, 0]
+    velocities[:, 1] = -midpoints[:, 0]
+    return velocities
+
+
+def initial_oil(midpoints):
+    """
+    Places oil mostly around (0.35, 0.45) to mimic an initial spill location.
+
+    Parameters:
+    - midpoints (ndarray): Cell midpoints of shape (N, 2).
+
+    Returns:
+    - ndarray: Initial oil value for each midpoint.
+    """
+    midpoints = np.asarray(midpoints)
+    x_start, y_start = 0.35, 0.45
+    return np.exp(
+        -((midpoints[:, 0] - x_start) ** 2 + (midpoints[:, 1] - y_start) ** 2) / 0.01
+    )
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _build_tri_geometry(tri_idx, points):
+    """
+    Compiled kernel behind triangle_geometry. Each triangle is handled independently,
+    so the loop is split across cores.
+    """
+    n = tri_idx.shape[0]
+    midpoints = np.empty((n, 2))
+    areas = np.empty(n)
+    normals = np.zeros((n, 3, 3))
+    for t in prange(n):
+        p0x, p0y = points[tri_idx[t, 0], 0], points[tri_idx[t, 0], 1]
+        p1x, p1y = points[tri_idx[t, 1], 0], points[tri_idx[t, 1], 1]
+        p2x, p2y = points[tri_idx[t, 2], 0], points[tri_idx[t, 2], 1]
+        mx = (p0x + p1x + p2x) / 3.0
+        my = (p0y + p1y + p2y) / 3.0
+        midpoints[t, 0] = mx
+        midpoints[t, 1] = my
+        # Same determinant-based formula as Triangle.
+        areas[t] = 0.5 * abs((p0x - p2x) * (p1y - p0y) - (p0x - p1x) * (p2y - p0y))
+
+        xs = (p0x, p1x, p2x)
+        ys = (p0y, p1y, p2y)
+        for i in range(3):
+            j = (i + 1) % 3
+            # Rotating the edge by 90 degrees gives a normal as long as the edge itself.
+            nx = -(ys[j] - ys[i])
+            ny = xs[j] - xs[i]
+            if nx * (xs[i] - mx) + ny * (ys[i] - my) < 0:
+                nx, ny = -nx, -ny
+            normals[t, i, 0] = nx
+            normals[t, i, 1] = ny
+    return midpoints, areas, normals
+
+
+def triangle_geometry(tri_idx, points):
+    """
+    Computes midpoints, areas, initial oil values and outward normals for many triangles at once.
+
+    Parameters:
+    - tri_idx (ndarray): Point indices of each triangle, shape (N, 3).
+    - points (ndarray): Coordinates of all mesh points, shape (M, 2) or (M, 3).
+
+    Returns:
+    - tuple: (midpoints (N, 2), areas (N,), oil_values (N,), normals (N, 3, 3)).
+    """
+    midpoints, areas, normals = _build_tri_geometry(
+        np.ascontiguousarray(tri_idx, dtype=np.intp),
+        np.ascontiguousarray(points, dtype=np.float64),
+    )
+    return midpoints, areas, initial_oil(midpoints), normals
+
+
+def _outward_normal(ax, ay, bx, by, mx, my):
+    """
+    Returns the normal of the edge a->b that points away from the midpoint (mx, my).
+
+    The edge rotated by 90 degrees is already as long as the edge,
+    which is the length the flux calculation needs.
+    """
+    nx, ny = -(by - ay), bx - ax
+    # Flip the direction if this normal points into the triangle.
+    if nx * (ax - mx) + ny * (ay - my) < 0:
+        nx, ny = -nx, -ny
+    return nx, ny, 0.0
+
+
+class CellArrays:
+    """
+    Stores the per-cell fields as one contiguous array per field (struct of arrays).
+
+    The Mesh keeps a single instance for all of its cells, so solver loops can work on
+    whole arrays. Cells created on their own get a private instance with one row.
+    """
+    def __init__(self, n_cells):
+        """
+        Allocates the arrays for a given number of cells.
+
+        Parameters:
+        - n_cells (int): Number of cells to store.
+        """
+        self.midpoints = np.zeros((n_cells, 2))
+        self.velocities = np.zeros((n_cells, 3))
+        # The oil field is read and written every time step, so it is kept in single precision
+        self.oil = np.zeros(n_cells, dtype=np.float32)
+        self.areas = np.zeros(n_cells)
+        self.normals = np.zeros((n_cells, 3, 3))
+        self.neighbors = np.full((n_cells, 3), -1, dtype=np.int32)
+        # Vertex indices of each cell, padded with -1 for cells with fewer than three points
+        self.point_ids = np.full((n_cells, 3), -1, dtype=np.int32)
 
 
 class Cell(ABC):
     """
     Base class for all cells. Provides shared attributes and structure for computing neighbors.
+
+    The numeric fields (midpoint, velocity, oil_value, area, normals, neighbors) are views
+    into a CellArrays instance, normally the mesh that owns the cell.
     """
-    def __init__(self, point_ids, idx, points):
-        self._point_ids = point_ids
+    def __init__(self, point_ids, idx, points, arrays=None):
         self._idx = idx
-        self.midpoint = np.mean(points, axis=0)
-        self.neighbors = [-1 for _ in point_ids]
         self._points = points
-        # Defines a velocity field that depends on midpoint coordinates,
-        # useful for simulating flow behavior in 2D.
-        self.velocity = np.array([
-            self.midpoint[1] - 0.2 * self.midpoint[0],
-            -self.midpoint[0],
-            0.0
-        ])
-        logging.debug(f"Cell {idx} initialized with midpoint {self.midpoint}.")
+        if arrays is None:
+            # A cell created outside a mesh keeps its fields in its own single-row storage.
+            self._arrays, self._row = CellArrays(1), 0
+            self._arrays.point_ids[0, :len(point_ids)] = point_ids
+            self._arrays.midpoints[0] = np.mean(points, axis=0)[:2]
+            self._arrays.velocities[0] = velocity_field(self._arrays.midpoints)[0]
+        else:
+            self._arrays, self._row = arrays, idx
+        # int32 view of this cell's row in point_ids, without the -1 padding
+        self._point_ids = self._arrays.point_ids[self._row, :len(point_ids)]
+
+    @property
+    def midpoint(self):
+        return self._arrays.midpoints[self._row]
+
+    @property
+    def velocity(self):
+        return self._arrays.velocities[self._row]
+
+    @property
+    def oil_value(self):
+        return self._arrays.oil[self._row]
+
+    @oil_value.setter
+    def oil_value(self, value):
+        self._arrays.oil[self._row] = value
+
+    @property
+    def area(self):
+        return self._arrays.areas[self._row]
 
-    def compute_neighbors(self, cells):
+    @property
+    def normals(self):
+        return self._arrays.normals[self._row]
+
+    @property
+    def neighbors(self):
+        return self._arrays.neighbors[self._row, :len(self._point_ids)]
+
+    def compute_neighbors(self, cells, point_sets):
         """
         Placeholder for neighbor logic. Subclasses specify how neighbors are determined.
         """
@@ -78,7 +240,7 @@ class Triangle(Cell):
     """
     A triangular cell with methods to calculate area, normals, and neighbor relationships.
     """
-    def __init__(self, point_ids, idx, points):
+    def __init__(self, point_ids, idx, points, arrays=None):
         """
         Computes the area and outward normals for a triangular cell.
 
@@ -86,67 +248,62 @@ class Triangle(Cell):
         - point_ids (list): Indices of the triangle's vertices.
         - idx (int): Unique index of this triangle in the mesh.
         - points (ndarray): Coordinates of the triangle's vertices.
+        - arrays (CellArrays, optional): Storage that already holds this triangle's
+          geometry (see triangle_geometry). If omitted, the geometry is computed here.
 
         Raises:
         - ValueError: If the cell is not exactly three points.
         """
-        super().__init__(point_ids, idx, points)
+        if arrays is None:
+            if len(point_ids) != 3:
+                raise ValueError("Triangle cells require three point indices.")
+            if points.shape[0] != 3:
+                raise ValueError("The points array must be shape (3, 2).")
+
+        super().__init__(point_ids, idx, points, arrays)
         self.type = "triangle"
-        self.coords = self._points
 
-        # Places oil mostly around (0.35, 0.45) to mimic an initial spill location.
-        x_start, y_start = 0.35, 0.45
-        self.oil_value = np.exp(
-            -((self.midpoint[0] - x_start) ** 2 + (self.midpoint[1] - y_start) ** 2) / 0.01
-        )
+        if arrays is not None:
+            return
 
-        if len(point_ids) != 3:
-            raise ValueError("Triangle cells require three point indices.")
-        if points.shape[0] != 3:
-            raise ValueError("The points array must be shape (3, 2).")
+        self.oil_value = initial_oil(self.midpoint[np.newaxis])[0]
+
+        x0, y0 = float(points[0][0]), float(points[0][1])
+        x1, y1 = float(points[1][0]), float(points[1][1])
+        x2, y2 = float(points[2][0]), float(points[2][1])
+        mx, my = self.midpoint
 
         # Uses a determinant-based formula for 2D triangular area.
-        self.area = 0.5 * abs(
-            (points[0][0] - points[2][0]) * (points[1][1] - points[0][1])
-            - (points[0][0] - points[1][0]) * (points[2][1] - points[0][1])
-        )
-
-        # Normals point outward, one for each edge of the triangle.
-        self.normals = [[-1, -1, -1] for _ in point_ids]
-        coords_list = list(points)
-        coords_cycle = coords_list[1:] + [coords_list[0]]
-
-        for i, (p1, p2) in enumerate(zip(coords_list, coords_cycle)):
-            v = np.array(p2) - np.array(p1)
-            normal = np.array([-v[1], v[0], 0.0])
-            # Flip the direction if this normal points into the triangle.
-            if np.dot(normal, p1 - self.midpoint) < 0:
-                normal *= -1
-            # Match the normal's length to the edge length for more accurate flux calculations.
-            self.normals[i] = normal / np.linalg.norm(normal) * np.linalg.norm(v)
-        logging.info(f"Triangle {idx} initialized with area {self.area} and oil_value {self.oil_value}.")
+        self._arrays.areas[self._row] = 0.5 * abs((x0 - x2) * (y1 - y0) - (x0 - x1) * (y2 - y0))
+
+        # Normals point outward, one for each edge of the triangle (0-1, 1-2, 2-0).
+        self.normals[0] = _outward_normal(x0, y0, x1, y1, mx, my)
+        self.normals[1] = _outward_normal(x1, y1, x2, y2, mx, my)
+        self.normals[2] = _outward_normal(x2, y2, x0, y0, mx, my)
 
     def __str__(self):
         return f"Triangle: {self.neighbors}"
 
-    def compute_neighbors(self, cells):
+    def compute_neighbors(self, cells, point_sets):
         """
         Finds triangles (or lines) that share two vertices with this triangle.
 
+        Meshes use compute_neighbors_soa instead; this handles cells used on their own.
+
         Parameters:
-        - cells (list): All cells in the mesh.
+        - cells (list): All cells in the mesh, where each cell's index is its position.
+        - point_sets (list): frozenset of point ids for each cell in cells, built once by
+          the caller (e.g. [frozenset(c._point_ids) for c in cells]) and shared between calls.
         """
-        my_points = set(self._point_ids)
-        for idx, cell in enumerate(cells):
-            if len(my_points & set(cell._point_ids)) == 2:
-                pts = list(self._point_ids)
-                pts_plus = pts[1:] + [pts[0]]
+        pts = list(self._point_ids)
+        pts_plus = pts[1:] + [pts[0]]
+        for idx, cell_points in enumerate(point_sets):
+            if len(point_sets[self._idx] & cell_points) == 2:
                 # We check each pair of consecutive points in this triangle
                 # to see if they match those in the neighbor.
                 for i, (p, pplus) in enumerate(zip(pts, pts_plus)):
-                    if p in cell._point_ids and pplus in cell._point_ids:
+                    if p in cell_points and pplus in cell_points:
                         self.neighbors[i] = idx
-                        logging.debug(f"Triangle {self._idx} assigned neighbor {idx}.")
                         break
 
 
@@ -154,14 +311,13 @@ class Line(Cell):
     """
     A line cell, generally used to denote boundaries or edges in the mesh.
     """
-    def __init__(self, point_ids, idx, points):
-        super().__init__(point_ids, idx, points)
+    def __init__(self, point_ids, idx, points, arrays=None):
+        super().__init__(point_ids, idx, points, arrays)
         self.type = "line"
         # Lines are treated as boundaries where oil does not accumulate.
         self.oil_value = 0.0
-        logging.info(f"Line {idx} initialized.")
 
-    def compute_neighbors(self, cells):
+    def compute_neighbors(self, cells, point_sets):
         """
         No neighbor logic here, but could be extended
         if lines need special boundary handling.
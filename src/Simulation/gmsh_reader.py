@@ -0,0 +1,174 @@
+import mmap
+import numpy as np
+
+# Gmsh element types handled here, mapped to their meshio name and number of nodes.
+GMSH_ELEMENT_TYPES = {
+    15: ("vertex", 1),
+    1: ("line", 2),
+    2: ("triangle", 3),
+}
+
+
+def read_gmsh(filename):
+    """
+    Reads an ASCII Gmsh file (format 2.2 or 4.1) straight into NumPy arrays.
+
+    This skips meshio's format detection and per-element Python parsing: each section is
+    converted with one bulk parse, and elements are returned in the same blocks, order and
+    0-based point numbering as meshio.read.
+
+    Parameters:
+    - filename (str): Path to the .msh file.
+
+    Returns:
+    - tuple: (points (M, 3), blocks), where blocks is a list of (cell_type, point_ids) pairs,
+      or None if the file uses a format or element type not handled here, or cannot be parsed.
+    """
+    # The file is memory-mapped, so only the section being parsed is ever copied into memory.
+    with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        try:
+            header = _section(data, b"MeshFormat").split()
+            if len(header) < 2 or header[1] != b"0":  # Only ASCII files
+                return None
+            version = header[0]
+
+            if version == b"2.2":
+                tags, points = _read_nodes_22(_section(data, b"Nodes"))
+                blocks = _read_elements_22(_section(data, b"Elements"))
+            elif version == b"4.1":
+                tags, points = _read_nodes_41(_section(data, b"Nodes"))
+                blocks = _read_elements_41(_section(data, b"Elements"))
+            else:
+                return None
+        # e.g. an element type missing from GMSH_ELEMENT_TYPES, or a missing or truncated section
+        except (KeyError, NotImplementedError, ValueError):
+            return None
+
+    # Node tags may be sparse, so translate them to positions in the points array.
+    lookup = np.full(tags.max() + 1, -1, dtype=np.int64)
+    lookup[tags] = np.arange(len(tags))
+    return points, [(cell_type, lookup[node_tags]) for cell_type, node_tags in blocks]
+
+
+def _section(data, name):
+    """
+    Returns the bytes between "$<name>" and "$End<name>", without the header line.
+
+    Raises:
+    - ValueError: If the section or its end marker is missing.
+    """
+    start = data.find(b"$" + name)
+    end = data.find(b"$End" + name, start)
+    if start < 0 or end < 0:
+        raise ValueError(f"Missing section ${name.decode()} in mesh file")
+    start = data.find(b"\n", start) + 1
+    return data[start:end]
+
+
+def _read_nodes_22(section):
+    """
+    Parses a format 2.2 $Nodes section.
+
+    Parameters:
+    - section (bytes): Contents of the section (see _section).
+
+    Returns:
+    - tuple: (node tags (M,), coordinates (M, 3)).
+    """
+    values = np.fromstring(section, dtype=np.float64, sep=" ")
+    rows = values[1:].reshape(int(values[0]), 4)  # tag x y z
+    return rows[:, 0].astype(np.int64), np.ascontiguousarray(rows[:, 1:])
+
+
+def _read_elements_22(section):
+    """
+    Parses a format 2.2 $Elements section into blocks of equal element type.
+
+    Parameters:
+    - section (bytes): Contents of the section (see _section).
+
+    Returns:
+    - list: (cell_type, node tags) pairs, with node tags of shape (count, num_nodes).
+    """
+    values = np.fromstring(section, dtype=np.int64, sep=" ")
+    remaining, pos = int(values[0]), 1
+    blocks = []
+    while remaining > 0:
+        # Row layout: tag type num_tags tags... nodes...
+        element_type, num_tags = values[pos + 1], values[pos + 2]
+        cell_type, num_nodes = GMSH_ELEMENT_TYPES[int(element_type)]
+        width = 3 + int(num_tags) + num_nodes
+
+        # Take every following row of the same shape in one go; the run ends at the first
+        # row whose type or tag count differs.
+        count = min(remaining, (len(values) - pos) // width)
+        rows = values[pos:pos + count * width].reshape(count, width)
+        differs = (rows[:, 1] != element_type) | (rows[:, 2] != num_tags)
+        if differs.any():
+            count = int(np.argmax(differs))
+            rows = rows[:count]
+
+        # meshio starts a new block whenever the element type changes.
+        if blocks and blocks[-1][0] == cell_type:
+            blocks[-1] = (cell_type, np.vstack([blocks[-1][1], rows[:, -num_nodes:]]))
+        else:
+            blocks.append((cell_type, rows[:, -num_nodes:]))
+        pos += count * width
+        remaining -= count
+    return blocks
+
+
+def _read_nodes_41(section):
+    """
+    Parses a format 4.1 $Nodes section.
+
+    Parameters:
+    - section (bytes): Contents of the section (see _section).
+
+    Returns:
+    - tuple: (node tags (M,), coordinates (M, 3)).
+
+    Raises:
+    - NotImplementedError: If a node block stores parametric coordinates.
+    """
+    values = np.fromstring(section, dtype=np.float64, sep=" ")
+    num_blocks, num_nodes = int(values[0]), int(values[1])
+    tags = np.empty(num_nodes, dtype=np.int64)
+    points = np.empty((num_nodes, 3))
+    pos, idx = 4, 0
+    for _ in range(num_blocks):
+        # Block header: entityDim entityTag parametric numNodes
+        parametric, count = int(values[pos + 2]), int(values[pos + 3])
+        if parametric:
+            raise NotImplementedError("Parametric nodes are not supported")
+        pos += 4
+        tags[idx:idx + count] = values[pos:pos + count]
+        pos += count
+        points[idx:idx + count] = values[pos:pos + 3 * count].reshape(count, 3)
+        pos += 3 * count
+        idx += count
+    return tags, points
+
+
+def _read_elements_41(section):
+    """
+    Parses a format 4.1 $Elements section, one block per entity.
+
+    Parameters:
+    - section (bytes): Contents of the section (see _section).
+
+    Returns:
+    - list: (cell_type, node tags) pairs, with node tags of shape (count, num_nodes).
+    """
+    values = np.fromstring(section, dtype=np.int64, sep=" ")
+    num_blocks, pos = int(values[0]), 4
+    blocks = []
+    for _ in range(num_blocks):
+        # Block header: entityDim entityTag elementType numElements
+        element_type, count = int(values[pos + 2]), int(values[pos + 3])
+        cell_type, num_nodes = GMSH_ELEMENT_TYPES[element_type]
+        pos += 4
+        rows = values[pos:pos + count * (1 + num_nodes)].reshape(count, 1 + num_nodes)
+        blocks.append((cell_type, rows[:, 1:]))
+        pos += count * (1 + num_nodes)
+    return blocks
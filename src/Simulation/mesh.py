@@ -1,14 +1,81 @@
 import meshio
-from src.Simulation.cells import CellFactory, Triangle, Line
+import numpy as np
+from src.Simulation.cache import cached
+from src.Simulation.gmsh_reader import read_gmsh
+from src.Simulation.cells import (
+    CELL_TYPE_TAGS, TRIANGLE, LINE, CellArrays, CellFactory, Triangle, Line, triangle_geometry, velocity_field
+)
 import logging
 
 
-class Mesh:
+def compute_neighbors_soa(type_tags, point_ids):
+    """
+    Finds the neighbor across every triangle edge from the per-cell arrays alone.
+
+    Each triangle edge and each line is turned into a key built from its two point indices.
+    Sorting the keys brings the cells that share an edge next to each other. When more than
+    one other cell shares an edge, the one with the highest index is used.
+
+    Parameters:
+        type_tags (ndarray): Cell type tag of each cell, shape (N,).
+        point_ids (ndarray): Point indices of each cell padded with -1, shape (N, 3).
+
+    Returns:
+        ndarray: Neighbor index for each cell edge (-1 if none), shape (N, 3), int32.
+    """
+    neighbors = np.full(point_ids.shape, -1, dtype=np.int32)
+    triangles = np.flatnonzero(type_tags == TRIANGLE)
+    lines = np.flatnonzero(type_tags == LINE)
+
+    # One entry per edge: owning cell, edge slot (-1 for lines, which get no neighbors) and end points
+    start = point_ids[triangles]
+    cells = np.concatenate([np.repeat(triangles, 3), lines])
+    slots = np.concatenate([np.tile(np.arange(3), len(triangles)), np.full(len(lines), -1)])
+    a = np.concatenate([start.ravel(), point_ids[lines, 0]]).astype(np.int64)
+    b = np.concatenate([np.roll(start, -1, axis=1).ravel(), point_ids[lines, 1]]).astype(np.int64)
+    keys = np.minimum(a, b) * (int(point_ids.max()) + 1) + np.maximum(a, b)
+
+    # Sort by edge, then by cell index, so the last entry of each group is its highest cell
+    order = np.lexsort((cells, keys))
+    keys, cells, slots = keys[order], cells[order], slots[order]
+    new_group = np.r_[True, keys[1:] != keys[:-1]]
+    group = np.cumsum(new_group) - 1
+    group_start = np.flatnonzero(new_group)
+    group_end = np.r_[group_start[1:], len(keys)]
+
+    highest = cells[group_end - 1][group]
+    second = np.where(group_end - group_start >= 2, cells[np.maximum(group_end - 2, 0)], -1)[group]
+    other = np.where(cells == highest, second, highest)
+
+    is_triangle_edge = slots >= 0
+    neighbors[cells[is_triangle_edge], slots[is_triangle_edge]] = other[is_triangle_edge]
+    return neighbors
+
+
+def fishing_mask(type_tags, midpoints, x_min, x_max, y_min, y_max):
+    """
+    Flags the triangles whose midpoints lie inside a rectangle.
+
+    Parameters:
+        type_tags (ndarray): Cell type tag of each cell, shape (N,).
+        midpoints (ndarray): Cell midpoints, shape (N, 2).
+        x_min, x_max, y_min, y_max (float): Bounds of the rectangle (inclusive).
+
+    Returns:
+        ndarray: Boolean mask of shape (N,).
+    """
+    x, y = midpoints[:, 0], midpoints[:, 1]
+    return (type_tags == TRIANGLE) & (x_min <= x) & (x <= x_max) & (y_min <= y) & (y <= y_max)
+
+
+class Mesh(CellArrays):
     """
     Represents the mesh used in the simulation.
 
     The Mesh class is responsible for reading a mesh file, initializing cells,
     finding neighbors, and identifying cells within specific areas, such as the fishing area.
+    The per-cell fields are stored on the mesh as contiguous arrays (see CellArrays),
+    and each cell object is a thin view into one row of them.
     """
 
     def __init__(self, filename):
@@ -21,10 +88,10 @@ class Mesh:
         Raises:
             FileNotFoundError: If the mesh file cannot be found or read.
         """
-        mesh = meshio.read(filename)  # Reads the mesh file
-        points = mesh.points  # Retrieves the coordinates of mesh points
-        cells = mesh.cells  # Retrieves the cell definitions
-        self._points = points
+        # Parsing is skipped when this exact file was seen before. Everything derived from the
+        # points (geometry, initial oil, velocities) is recomputed, so code changes take effect.
+        self._points, self._blocks = cached("mesh", filename, lambda: self._read(filename))
+        self._fill_arrays()
 
         # Initialize the cell factory and register cell types
         factory = CellFactory()
@@ -34,17 +101,65 @@ class Mesh:
         self._cells = []
 
         # Loop through all cell types and add them to the mesh
-        for cell_type_and_data in cells:
-            cell_type = cell_type_and_data.type
-            if cell_type == "vertex":  # Skip vertex cells
-                continue
-            cellindices = cell_type_and_data.data
+        for cell_type, cellindices in self._blocks:
             for cell_idx in cellindices:
                 # Create and store a new cell
-                cell = factory(cell_type, cell_idx, len(self._cells), points[cell_idx, :])
+                cell = factory(cell_type, cell_idx, len(self._cells), self._points[cell_idx, :], arrays=self)
                 self._cells.append(cell)
 
-        logging.info(f"Initialized {len(self._cells)} cells from mesh.")
+        # One summary line per mesh instead of a log call for every cell
+        logging.info(
+            f"Initialized {len(self._cells)} cells from mesh "
+            f"({np.count_nonzero(self.type_tags == TRIANGLE)} triangles, "
+            f"{np.count_nonzero(self.type_tags == LINE)} lines)."
+        )
+
+    def _read(self, filename):
+        """
+        Reads the mesh file.
+
+        Parameters:
+            filename (str): Path to the mesh file.
+
+        Returns:
+            tuple: (points, blocks) with the coordinates of the mesh points and the
+            (cell_type, point_ids) blocks without vertex cells, suitable for caching.
+        """
+        # ASCII Gmsh files are parsed directly; anything else goes through meshio
+        mesh = read_gmsh(filename) if filename.endswith(".msh") else None
+        if mesh is None:
+            mesh = meshio.read(filename)  # Reads the mesh file
+            mesh = mesh.points, [(block.type, block.data) for block in mesh.cells]
+        points, blocks = mesh  # Coordinates of mesh points and the cell definitions
+        blocks = [
+            (cell_type, cellindices) for cell_type, cellindices in blocks
+            if cell_type != "vertex"  # Skip vertex cells
+        ]
+        return points, blocks
+
+    def _fill_arrays(self):
+        """
+        Allocates the per-cell arrays and fills them from the points and cell blocks.
+        """
+        points = self._points
+        n_cells = sum(len(cellindices) for _, cellindices in self._blocks)
+        super().__init__(n_cells)
+        self.type_tags = np.empty(n_cells, dtype=np.int8)  # See CELL_TYPE_TAGS
+
+        start = 0
+        for cell_type, cellindices in self._blocks:
+            stop = start + len(cellindices)
+            self.type_tags[start:stop] = CELL_TYPE_TAGS[cell_type]
+            self.point_ids[start:stop, :cellindices.shape[1]] = cellindices
+            # Fill the geometry of the whole block in one vectorized pass
+            if cell_type == "triangle":
+                (self.midpoints[start:stop], self.areas[start:stop],
+                 self.oil[start:stop], self.normals[start:stop]) = triangle_geometry(cellindices, points)
+            else:
+                self.midpoints[start:stop] = points[cellindices][:, :, :2].mean(axis=1)
+            start = stop
+
+        self.velocities[:] = velocity_field(self.midpoints)
 
     def find_neighbors(self):
         """
@@ -54,8 +169,8 @@ class Mesh:
         calculating flux and other simulation properties.
         """
         logging.info("Calculating neighbors for all cells.")
-        for cell in self._cells:
-            cell.compute_neighbors(self._cells)
+
+        self.neighbors[:] = compute_neighbors_soa(self.type_tags, self.point_ids)
         logging.info("Neighbor calculation completed.")
 
     def cells(self):
@@ -83,11 +198,7 @@ class Mesh:
         Returns:
             list: A list of cells within the fishing area.
         """
-        fishing_cells = [
-            cell for cell in self._cells
-            if cell.type == "triangle" and
-            x_min <= cell.midpoint[0] <= x_max and
-            y_min <= cell.midpoint[1] <= y_max
-        ]
+        inside = fishing_mask(self.type_tags, self.midpoints, x_min, x_max, y_min, y_max)
+        fishing_cells = [self._cells[idx] for idx in np.flatnonzero(inside)]
         logging.info(f"Identified {len(fishing_cells)} cells in the fishing area.")
         return fishing_cells
@@ -1,9 +1,53 @@
 import numpy as np
 from src.Simulation.mesh import Mesh as Mesh
+from src.Simulation.cells import TRIANGLE
 import logging
+import math
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.tri import Triangulation
 import cv2
 import os
+from numba import njit, prange
+
+
+@njit(fastmath=True, cache=True, inline="always")
+def _upwind(a, b, ang):
+    """
+    Branchless upwind flux over one edge: a * ang for outflow and b * ang for inflow.
+    """
+    return 0.5 * ((a + b) * ang + (a - b) * math.fabs(ang))
+
+
+@njit(parallel=True, fastmath=True, cache=True, boundscheck=False)
+def _sweep(oil, oil_new, ngh, angle, dt_over_area):
+    """
+    Compiled upwind update for all cells, split across cores.
+
+    prange gives each thread one contiguous slice of the cells, so every thread streams
+    through its own stretch of the arrays.
+    Every cell has exactly three edge slots, so the edge loop is written out by hand.
+
+    Parameters:
+    - oil (ndarray): Oil values at the start of the step, shape (N,), float32.
+    - oil_new (ndarray): Receives the oil values after the step, shape (N,), float32.
+    - ngh (ndarray): Neighbor index of each edge, shape (N, 3).
+    - angle (ndarray): Normal times averaged velocity for each edge (0 on boundaries), shape (N, 3), float32.
+    - dt_over_area (ndarray): Time step divided by cell area (0 for lines), shape (N,), float32.
+
+    The edge sum is accumulated in double precision and only the result is stored as float32.
+    """
+    for i in prange(oil.shape[0]):
+        # The cell's own value is loaded once and the edge sum stays in a local,
+        # so each cell reads its row of the inputs and writes oil_new exactly once
+        a = oil[i]
+        acc = (
+            _upwind(a, oil[ngh[i, 0]], angle[i, 0])
+            + _upwind(a, oil[ngh[i, 1]], angle[i, 1])
+            + _upwind(a, oil[ngh[i, 2]], angle[i, 2])
+        )
+        oil_new[i] = a - dt_over_area[i] * acc
 
 
 class Solver:
@@ -27,13 +71,25 @@ class Solver:
         self._nt = config["settings"]["nSteps"]
         self._log_name = config["IO"]["logName"]
         self._write_frequency = config["IO"]["writeFrequency"]
+        # Frames go straight into the video; PNG copies of every frame are only written when
+        # asked for (for debugging). The final frame is always saved.
+        self._save_images = config["IO"].get("saveImages", False)
+        self._video = None  # Opened by _write_frame once the frame size is known
+        self._play_video = config["IO"].get("playVideo", False)
 
         self.dt = (self._tEnd - self._tStart) / float(self._nt)
+        self._precompute_edges()
 
         # Get fishing area borders
         self.fishing_borders = config["geometry"]["borders"]
+        x_min, x_max = self.fishing_borders[0]
+        y_min, y_max = self.fishing_borders[1]
+        fishing_cells = self._mesh.fishing_cells(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+        # Indices into the oil array, so the fishing area total is one NumPy reduction per step
+        self._fishing_idx = np.fromiter((cell._idx for cell in fishing_cells), dtype=np.int32)
 
         self.image_counter = 0  # Starts at 0 for image filenames
+        self._plot = None  # Built by _figure when the first image is made
 
         # Restart logic
         self.restart_file = config["IO"].get("restartFile")
@@ -53,7 +109,34 @@ class Solver:
         - v (array): Velocity vector.
         """
         angle = np.dot(n, v)
-        return a * angle if angle > 0 else b * angle
+        # Same as a * angle for outflow and b * angle for inflow, without a branch
+        return 0.5 * ((a + b) * angle + (a - b) * abs(angle))
+
+    def _precompute_edges(self):
+        """
+        Computes the parts of the flux that stay the same for every time step.
+
+        Velocities, normals and areas do not change during the simulation, so the
+        velocity-normal product of each edge and dt/area of each cell are computed once.
+        """
+        mesh = self._mesh
+        has_ngh = mesh.neighbors >= 0  # Boundary edges have no neighbor (-1)
+        self._ngh = np.where(has_ngh, mesh.neighbors, 0)
+
+        # Velocity at each edge is the average of the two cells sharing it
+        velocity = 0.5 * (mesh.velocities[:, np.newaxis, :] + mesh.velocities[self._ngh])
+        angle = np.einsum("ijk,ijk->ij", mesh.normals, velocity)
+        angle[~has_ngh] = 0.0  # No flux over boundary edges
+        # Stored in single precision like the oil field, to halve the bytes read per step
+        self._angle = angle.astype(np.float32)
+
+        # Lines have no area and no neighbors, so their oil value is left unchanged
+        self._dt_over_area = np.divide(
+            self.dt, mesh.areas, out=np.zeros_like(mesh.areas), where=mesh.areas > 0
+        ).astype(np.float32)
+
+        # Second oil buffer for calculate, so no array is allocated per time step
+        self._oil_next = np.empty_like(mesh.oil)
 
     def calculate(self):
         """
@@ -61,22 +144,13 @@ class Solver:
           1. Compute flux for each triangle cell.
           2. Sum flux contributions.
           3. Update cell.oil_value.
+
+        The update runs as one compiled loop over the mesh arrays (see _sweep). The new values
+        go into a scratch array kept between steps, which then swaps places with mesh.oil.
         """
-        u = [cell.oil_value for cell in self._mesh.cells()]
-        u_new = np.zeros_like(u)
-        for cell_idx, cell in enumerate(self._mesh.cells()):
-            up = 0
-            for i, ngh in enumerate(cell.neighbors):
-                if ngh < 0:  # Skip boundary cells
-                    continue
-                normal = cell.normals[i]
-                area = cell.area
-                velocity = 0.5 * (cell.velocity + self._mesh.cells()[ngh].velocity)
-                up -= (self.dt / area) * self.flux_function(u[cell_idx], u[ngh], normal, velocity)
-            u_new[cell_idx] = u[cell_idx] + up
-
-        for cell_idx, cell in enumerate(self._mesh.cells()):
-            cell.oil_value = u_new[cell_idx]
+        u = self._mesh.oil
+        _sweep(u, self._oil_next, self._ngh, self._angle, self._dt_over_area)
+        self._mesh.oil, self._oil_next = self._oil_next, u
 
     def run_simulation(self, config_name):
         """
@@ -85,50 +159,53 @@ class Solver:
         Parameters:
         - config_name (str): Name of the configuration file (used for naming outputs).
         """
-        current_time = self._tStart
         interval = max(1, self._nt // self._write_frequency) if self._write_frequency > 0 else -1
-        fishing_oil_data = []
+        # Time and fishing area oil of every step, one row per step; the oil column is filled as we go
+        fishing_oil_data = np.empty((self._nt + 1, 2))
+        fishing_oil_data[:, 0] = self._tStart + np.arange(self._nt + 1) * self.dt
 
         # Check writeFrequency validity
         if self._write_frequency <= 0:
             print("writeFrequency is invalid or not provided. Skipping video recording and image creation.")
             logging.warning("writeFrequency is invalid or not provided. Skipping video recording and image creation.")
 
-        x_min, x_max = self.fishing_borders[0]
-        y_min, y_max = self.fishing_borders[1]
-        fishing_cells = self._mesh.fishing_cells(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+        # Every configuration gets its own plots folder, so runs can happen side by side.
+        plots_folder = os.path.join("plots", os.path.splitext(config_name)[0])
+        video_path = os.path.join(plots_folder, "simulation.avi")
 
         logging.info(f"Running simulation for {config_name}.")
         print("Starting simulation...")
 
         # Skip image creation if writeFrequency <= 0
         if self._write_frequency > 0:
-            self.create_image(timestep=0)
+            self._write_frame(self.create_image(timestep=0, output_folder=plots_folder), video_path)
 
-        fishing_oil_data.append((current_time, sum(cell.oil_value for cell in fishing_cells)))
+        fishing_oil_data[0, 1] = self.fishing_oil()
         print("Calculating and plotting results...")
 
         for step in range(1, self._nt + 1):
             self.calculate()
-            current_time = self._tStart + step * self.dt
-            fishing_oil = sum(cell.oil_value for cell in fishing_cells)
-            fishing_oil_data.append((current_time, fishing_oil))
+            fishing_oil_data[step, 1] = self.fishing_oil()
 
             # Only create images at intervals if writeFrequency > 0
             if self._write_frequency > 0 and step % interval == 0:
+                current_time, fishing_oil = fishing_oil_data[step]
                 logging.info(f"Step {step}, time = {current_time:.3f}, Fishing Area Oil = {fishing_oil:.6f}")
-                self.create_image(timestep=step)
+                self._write_frame(self.create_image(timestep=step, output_folder=plots_folder), video_path)
 
          # Final image and video creation (if writeFrequency > 0)
         if self._write_frequency > 0:
-            self.create_image(timestep="Final")
-            self.create_video(output_folder="plots", output_video="simulation.avi")
+            self._write_frame(self.create_image(timestep="Final", output_folder=plots_folder), video_path)
+            self._video.release()
+            self._video = None
+            logging.info(f"Video saved as {video_path}")
             print("Simulation video created.")
 
-            # Play the video after creation
-            print("Playing simulation video...")
-            self.play_video(video_path="simulation.avi")
-            print("Video playback complete.")
+            # Play the video after creation, only when asked for (it waits on a GUI window)
+            if self._play_video:
+                print("Playing simulation video...")
+                self.play_video(video_path=video_path)
+                print("Video playback complete.")
 
         # Plotting and saving results
         self.plot_fishing_oil(fishing_oil_data, config_name=config_name)
@@ -137,19 +214,25 @@ class Solver:
         logging.info("Simulation complete.")
         print("Simulation complete.")
 
+    def fishing_oil(self):
+        """
+        Returns the total oil in the fishing area (summed in double precision).
+        """
+        return float(self._mesh.oil[self._fishing_idx].sum(dtype=np.float64))
+
     def plot_fishing_oil(self, fishing_oil_data, config_name, output_folder="result_folder"):
         """
         Plot fishing area oil data and save it as an image.
 
         Parameters:
-        - fishing_oil_data (list): Data for fishing oil over time.
+        - fishing_oil_data (ndarray): (time, fishing area oil) rows, shape (steps, 2).
         - config_name (str): Name of the configuration file (used for naming the subfolder).
         - output_folder (str): Path to the folder where the plot will be saved.
         """
         subfolder = os.path.join(output_folder, os.path.splitext(config_name)[0])
         os.makedirs(subfolder, exist_ok=True)
 
-        times, oil_values = zip(*fishing_oil_data)
+        times, oil_values = np.asarray(fishing_oil_data).T
         plt.figure()
         plt.plot(times, oil_values, label="Fishing Area Oil", color="blue")
         plt.xlabel("Time")
@@ -163,98 +246,121 @@ class Solver:
         plt.close()
         logging.info(f"Fishing area oil plot saved to {output_file}")
 
+    def _figure(self):
+        """
+        Returns the figure used for the oil plots, built on first use.
+
+        The figure, axes, colorbar and the collection holding the triangles are created once;
+        later frames only update the triangle colors.
+
+        Returns:
+        - tuple: (Figure, PolyCollection of the triangle cells, cell index of each triangle).
+        """
+        if self._plot is None:
+            mesh = self._mesh
+            triangle_ids = np.flatnonzero(mesh.type_tags == TRIANGLE)
+            triangulation = Triangulation(mesh._points[:, 0], mesh._points[:, 1], mesh.point_ids[triangle_ids])
+
+            # Drawn off screen with Agg, so the figure is not managed by pyplot
+            fig = Figure()
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+
+            # Fixed normalization range for oil values
+            norm = plt.Normalize(vmin=0, vmax=1)
+            # All triangles are colored by one collection instead of one patch per cell
+            collection = ax.tripcolor(
+                triangulation, facecolors=mesh.oil[triangle_ids], cmap="viridis", norm=norm,
+                shading="flat", edgecolors="face", alpha=0.9, rasterized=True
+            )
+
+            # Highlight the fishing area
+            x_min, x_max = self.fishing_borders[0]
+            y_min, y_max = self.fishing_borders[1]
+            fishing_area = plt.Rectangle(
+                (x_min, y_min),  # Bottom-left corner
+                x_max - x_min,   # Width (x-range)
+                y_max - y_min,   # Height (y-range)
+                edgecolor="red", facecolor="none", linestyle="--", linewidth=2, label="Fishing Area"
+            )
+            ax.add_patch(fishing_area)
+
+            # Set up colorbar
+            fig.colorbar(collection, ax=ax, label="Oil Value")
+
+            # Add labels and formatting
+            ax.set_xlabel("X Coordinate")
+            ax.set_ylabel("Y Coordinate")
+            ax.set_aspect("equal")
+            ax.set_xlim(0, 1)  # Adjust these based on your mesh's extents
+            ax.set_ylim(0, 1)  # Adjust these based on your mesh's extents
+            ax.legend(loc="upper right")
+
+            self._plot = fig, collection, triangle_ids
+        return self._plot
+
     def create_image(self, timestep=None, output_folder="plots"):
         """
-        Create a plot of the oil distribution and save it as an image file.
+        Create a plot of the oil distribution and return it as a video frame.
+
+        The final frame is always saved as a PNG file; the other frames only when
+        saveImages is set in the configuration.
 
         Parameters:
         - timestep (int, optional): The current timestep to include in the file name.
         - output_folder (str): Directory to save the images.
+
+        Returns:
+        - ndarray: The rendered plot as a BGR image, shape (height, width, 3).
         """
         os.makedirs(output_folder, exist_ok=True)
-        plt.figure()
-        ax = plt.gca()
-
-        # Fixed normalization range for oil values
-        norm = plt.Normalize(vmin=0, vmax=1)
-        for cell in self._mesh.cells():
-            if cell.type == "triangle":
-                coords = cell._points
-                oil_value = cell.oil_value
-                color = plt.cm.viridis(norm(oil_value))
-                triangle = plt.Polygon(coords[:, :2], color=color, alpha=0.9)
-                ax.add_patch(triangle)
-
-        # Highlight the fishing area
-        x_min, x_max = self.fishing_borders[0]
-        y_min, y_max = self.fishing_borders[1]
-        fishing_area = plt.Rectangle(
-            (x_min, y_min),  # Bottom-left corner
-            x_max - x_min,   # Width (x-range)
-            y_max - y_min,   # Height (y-range)
-            edgecolor="red", facecolor="none", linestyle="--", linewidth=2, label="Fishing Area"
-        )
-        ax.add_patch(fishing_area)
-
-        # Set up colorbar
-        sm = plt.cm.ScalarMappable(cmap="viridis", norm=norm)
-        sm.set_array([])  # Empty array to configure the colorbar
-        cbar = plt.colorbar(sm, ax=ax, label="Oil Value")  # Add colorbar with label
+        fig, collection, triangle_ids = self._figure()
+        collection.set_array(self._mesh.oil[triangle_ids])
 
-        # Add labels and formatting
-        ax.set_xlabel("X Coordinate")
-        ax.set_ylabel("Y Coordinate")
-        ax.set_aspect("equal")
-        ax.set_xlim(0, 1)  # Adjust these based on your mesh's extents
-        ax.set_ylim(0, 1)  # Adjust these based on your mesh's extents
-        ax.legend(loc="upper right")
+        # Render once and take the pixels straight from the canvas
+        fig.canvas.draw()
+        frame = cv2.cvtColor(np.asarray(fig.canvas.buffer_rgba()), cv2.COLOR_RGBA2BGR)
 
         # Save the image with zero-padded sequential filenames
         self.image_counter += 1
-        file_name = f"image_{self.image_counter:03d}.png"
-        output_path = os.path.join(output_folder, file_name)
-        plt.savefig(output_path)
-        plt.close()
-        logging.debug(f"Saved plot for timestep {timestep} as {output_path}")
-
-    def create_video(self, output_folder="plots", output_video="simulation.avi", fps=5):
+        if self._save_images or timestep == "Final":
+            file_name = f"image_{self.image_counter:03d}.png"
+            output_path = os.path.join(output_folder, file_name)
+            cv2.imwrite(output_path, frame)
+            logging.debug(f"Saved plot for timestep {timestep} as {output_path}")
+        return frame
+
+    def _write_frame(self, frame, video_path, fps=5):
         """
-        Creates a video from image files in the exact order they appear in the directory.
+        Appends a frame to the simulation video, opening the video file on the first frame.
 
         Parameters:
-        - output_folder (str): Directory where image files are stored.
-        - output_video (str): Name of the output video file.
+        - frame (ndarray): BGR image from create_image.
+        - video_path (str): Path of the output video file.
         - fps (int): Frames per second for the video.
         """
-        images = [os.path.join(output_folder, f) for f in os.listdir(output_folder) if f.endswith(".png")]
-
-        if not images:
-            logging.warning("No images found for video creation.")
-            return
-
-        frame = cv2.imread(images[0])
-        height, width, layers = frame.shape
-        fourcc = cv2.VideoWriter_fourcc(*'XVID')
-        video = cv2.VideoWriter(output_video, fourcc, fps, (width, height))
-
-        for image in images:
-            video.write(cv2.imread(image))
-
-        video.release()
-        logging.info(f"Video saved as {output_video}")
+        if self._video is None:
+            height, width = frame.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*'XVID')
+            self._video = cv2.VideoWriter(video_path, fourcc, fps, (width, height))
+        self._video.write(frame)
 
-    def play_video(self, video_path="simulation.avi", frame_delay=1000):
+    def play_video(self, video_path="simulation.avi", frame_delay=None):
         """
         Plays the generated video using OpenCV.
 
         Parameters:
         - video_path (str): Path to the video file to be played.
-        - frame_delay (int): Delay between frames in milliseconds (default is 100 ms).
+        - frame_delay (int, optional): Delay between frames in milliseconds
+          (default is one frame at the video's own frame rate).
         """
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             logging.error(f"Unable to open video file {video_path}")
             return
+        if frame_delay is None:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_delay = max(1, int(1000 / fps)) if fps > 0 else 200
         print("Video created, press q to exit.")
         while cap.isOpened():
             ret, frame = cap.read()
@@ -272,6 +378,13 @@ class Solver:
     def load_state(self, folder):
         """
         Load the simulation state from the given folder.
+
+        Parameters:
+        - folder (str): Result folder written by save_state.
+
+        Raises:
+        - FileNotFoundError: If the restart files are missing.
+        - ValueError: If the number of oil values does not match the number of cells.
         """
         oil_values_file = os.path.join(folder, "oil_values.txt")
         simulation_data_file = os.path.join(folder, "simulation_data.txt")
@@ -279,10 +392,13 @@ class Solver:
         if not os.path.exists(oil_values_file) or not os.path.exists(simulation_data_file):
             raise FileNotFoundError(f"Missing restart files in folder: {folder}")
 
-        with open(oil_values_file, "r") as f:
-            oil_values = [float(line.strip()) for line in f.readlines()]
-        for cell, value in zip(self._mesh.cells(), oil_values):
-            cell.oil_value = value
+        oil_values = np.loadtxt(oil_values_file, ndmin=1)
+        if len(oil_values) != len(self._mesh.oil):
+            raise ValueError(
+                f"Restart file {oil_values_file} has {len(oil_values)} oil values, "
+                f"but the mesh has {len(self._mesh.oil)} cells"
+            )
+        self._mesh.oil[:] = oil_values
 
         with open(simulation_data_file, "r") as f:
             for line in f:
@@ -306,27 +422,21 @@ class Solver:
         subfolder = os.path.join(output_folder, os.path.splitext(config_name)[0])
         os.makedirs(subfolder, exist_ok=True)
 
+        oil_values = self._mesh.oil
+
         # Save oil values
         oil_values_file = os.path.join(subfolder, "oil_values.txt")
-        with open(oil_values_file, "w") as f:
-            for cell in self._mesh.cells():
-                f.write(f"{cell.oil_value}\n")
+        # Nine significant digits are enough to read float32 values back unchanged
+        np.savetxt(oil_values_file, oil_values, fmt="%.9g")
         logging.info(f"Oil values saved to {oil_values_file}")
 
         # Save simulation metadata
         simulation_data_file = os.path.join(subfolder, "simulation_data.txt")
         with open(simulation_data_file, "w") as f:
-            max_oil = max(cell.oil_value for cell in self._mesh.cells())
-            min_oil = min(cell.oil_value for cell in self._mesh.cells())
-            total_oil = sum(cell.oil_value for cell in self._mesh.cells())
-            fishing_grounds_oil = sum(
-                cell.oil_value for cell in self._mesh.fishing_cells(
-                    x_min=self.fishing_borders[0][0],
-                    x_max=self.fishing_borders[0][1],
-                    y_min=self.fishing_borders[1][0],
-                    y_max=self.fishing_borders[1][1]
-                )
-            )
+            max_oil = float(oil_values.max())
+            min_oil = float(oil_values.min())
+            total_oil = float(oil_values.sum(dtype=np.float64))
+            fishing_grounds_oil = self.fishing_oil()
 
             f.write(f"tStart: {self._tStart}\n")
             f.write(f"tEnd: {self._tEnd}\n")
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    """
+    keeps the mesh cache of every test in its own temporary folder instead of the project's cache folder
+    """
+    monkeypatch.setattr("src.Simulation.cache.CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
@@ -38,7 +38,8 @@ def test_cell_initialization(point_ids, idx, points, expected_midpoint, expected
     cell = TestCell(point_ids, idx, points)
 
     # Validate attributes
-    assert cell._point_ids == point_ids
+    assert list(cell._point_ids) == point_ids
+    assert cell._point_ids.dtype == np.int32
     assert cell._idx == idx
     np.testing.assert_array_equal(cell._points, points)
     np.testing.assert_almost_equal(cell.midpoint, expected_midpoint)
@@ -1,5 +1,8 @@
 import pytest
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 import numpy as np
 from src.Simulation.solver import Solver
 
@@ -9,7 +12,7 @@ def solver_instance():
     """
     fixture to initialze a solver instance with fake configuration
     """
-    mock_config = toml.loads("""
+    mock_config = tomllib.loads("""
     [settings]
     nSteps = 10
     tStart = 0.0
@@ -44,3 +47,76 @@ def test_flux_function(solver_instance, a, b, n, v, expected_flux):
     result = solver.flux_function(a, b, n, v)
     assert np.isclose(result, expected_flux), f"Expected {expected_flux}, got {result}"
 
+
+def test_calculate_matches_flux_function(solver_instance):
+    """
+    making sure one vectorized time step gives the same oil values as summing
+    flux_function over every edge
+    """
+    solver = solver_instance
+    cells = solver._mesh.cells()
+    u = np.array([cell.oil_value for cell in cells], dtype=float)
+    expected = u.copy()
+    for cell_idx, cell in enumerate(cells):
+        for i, ngh in enumerate(cell.neighbors):
+            if ngh < 0:
+                continue
+            velocity = 0.5 * (cell.velocity + cells[ngh].velocity)
+            expected[cell_idx] -= (solver.dt / cell.area) * solver.flux_function(
+                u[cell_idx], u[ngh], cell.normals[i], velocity
+            )
+
+    solver.calculate()
+    result = np.array([cell.oil_value for cell in cells], dtype=float)
+    # The oil field is stored in single precision
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_fishing_oil_matches_fishing_cells(solver_instance):
+    """
+    the vectorized fishing area total should equal the sum over the fishing cells
+    """
+    solver = solver_instance
+    fishing_cells = solver._mesh.fishing_cells(0.0, 0.45, 0.0, 0.2)
+    expected = sum(float(cell.oil_value) for cell in fishing_cells)
+    assert np.isclose(solver.fishing_oil(), expected)
+
+
+def test_create_image_saves_only_final_frame_by_default(solver_instance, tmp_path):
+    """
+    without saveImages only the final frame should be written as a PNG, but every call returns a frame
+    """
+    solver = solver_instance
+    frame = solver.create_image(timestep=1, output_folder=str(tmp_path))
+    assert frame.ndim == 3 and frame.shape[2] == 3
+    assert list(tmp_path.glob("*.png")) == []
+
+    solver.create_image(timestep="Final", output_folder=str(tmp_path))
+    assert [p.name for p in tmp_path.glob("*.png")] == ["image_002.png"]
+
+
+def test_save_and_load_state_round_trip(solver_instance, tmp_path):
+    """
+    oil values written by save_state should be read back unchanged by load_state
+    """
+    solver = solver_instance
+    for _ in range(3):
+        solver.calculate()
+    expected = solver._mesh.oil.copy()
+    solver.save_state(config_name="run.toml", output_folder=str(tmp_path))
+
+    solver._mesh.oil[:] = 0.0
+    solver.load_state(str(tmp_path / "run"))
+    np.testing.assert_array_equal(solver._mesh.oil, expected)
+
+
+def test_load_state_rejects_wrong_length(solver_instance, tmp_path):
+    """
+    a restart file with a different number of oil values than the mesh has cells should be rejected
+    """
+    solver = solver_instance
+    solver.save_state(config_name="run.toml", output_folder=str(tmp_path))
+    np.savetxt(tmp_path / "run" / "oil_values.txt", np.zeros(len(solver._mesh.oil) - 1))
+
+    with pytest.raises(ValueError, match=f"{len(solver._mesh.oil) - 1} oil values"):
+        solver.load_state(str(tmp_path / "run"))
@@ -0,0 +1,48 @@
+import pytest
+import meshio
+import numpy as np
+from src.Simulation.gmsh_reader import read_gmsh
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "src/Simulation/data/simple.msh",  # format 2.2
+        "src/Simulation/data/bay.msh",     # format 4.1
+    ],
+)
+def test_read_gmsh_matches_meshio(filename):
+    """
+    making sure the fast reader gives the same points and cell blocks as meshio
+    """
+    expected = meshio.read(filename)
+    points, blocks = read_gmsh(filename)
+
+    np.testing.assert_array_equal(points, expected.points)
+    assert [cell_type for cell_type, _ in blocks] == [block.type for block in expected.cells]
+    for (_, data), block in zip(blocks, expected.cells):
+        np.testing.assert_array_equal(data, block.data)
+
+
+def test_read_gmsh_unsupported_element(tmp_path):
+    """
+    making sure unknown element types return None so meshio can be used instead
+    """
+    filename = tmp_path / "quad.msh"
+    filename.write_text(
+        "$MeshFormat\n2.2 0 8\n$EndMeshFormat\n"
+        "$Nodes\n4\n1 0 0 0\n2 1 0 0\n3 1 1 0\n4 0 1 0\n$EndNodes\n"
+        "$Elements\n1\n1 3 2 1 1 1 2 3 4\n$EndElements\n"
+    )
+    assert read_gmsh(str(filename)) is None
+
+
+def test_read_gmsh_truncated_file(tmp_path):
+    """
+    making sure a file with a missing section returns None instead of raising, so meshio can be used instead
+    """
+    filename = tmp_path / "truncated.msh"
+    with open("src/Simulation/data/simple.msh") as source:
+        content = source.read()
+    filename.write_text(content[:content.index("$Elements")])
+    assert read_gmsh(str(filename)) is None
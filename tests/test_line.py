@@ -23,7 +23,7 @@ def test_line_point_ids_and_idx(point_ids, idx):
     points = np.array([[0.0, 0.0], [1.0, 0.0]])
     line = Line(point_ids, idx, points)
 
-    assert line._point_ids == point_ids 
+    assert list(line._point_ids) == point_ids 
     assert line._idx == idx
 
 # making sure points are set correctly
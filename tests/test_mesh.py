@@ -1,6 +1,7 @@
 import pytest
-from src.Simulation.mesh import Mesh
-from src.Simulation.cells import Triangle, Line
+import numpy as np
+from src.Simulation.mesh import Mesh, compute_neighbors_soa
+from src.Simulation.cells import Triangle, Line, TRIANGLE, LINE
 
 # Fixture to create a Mesh instance
 @pytest.fixture
@@ -26,7 +27,7 @@ def test_find_neighbors(mesh_instance):
     mesh_instance.find_neighbors()
     for cell in mesh_instance._cells:
         assert hasattr(cell, 'neighbors'), "Each cell should have a 'neighbors' attribute."
-        assert isinstance(cell.neighbors, list), "Neighbors should be a list."
+        assert isinstance(cell.neighbors, np.ndarray), "Neighbors should be an array."
 
 def test_cells_method(mesh_instance):
     """
@@ -51,3 +52,46 @@ def test_unsupported_cell_type():
     # Check that only supported types are processed
     for cell in mesh._cells:
         assert cell["type"] in ["triangle", "line"], "Unsupported cell type should not be processed."
+
+def test_cells_are_views_into_mesh_arrays(mesh_instance):
+    """
+    making sure cell fields read and write the mesh arrays
+    """
+    cell = mesh_instance._cells[-1]
+    cell.oil_value = 0.25
+    assert mesh_instance.oil[cell._idx] == 0.25
+    np.testing.assert_array_equal(cell.midpoint, mesh_instance.midpoints[cell._idx])
+    assert cell.area == mesh_instance.areas[cell._idx]
+
+def test_compute_neighbors_soa():
+    """
+    making sure shared edges are found from the type and point arrays
+    """
+    type_tags = np.array([LINE, TRIANGLE, TRIANGLE])
+    point_ids = np.array([[0, 1, -1], [0, 1, 2], [2, 1, 3]])
+    neighbors = compute_neighbors_soa(type_tags, point_ids)
+
+    np.testing.assert_array_equal(neighbors[0], [-1, -1, -1])  # lines get no neighbors
+    np.testing.assert_array_equal(neighbors[1], [0, 2, -1])    # boundary line and second triangle
+    np.testing.assert_array_equal(neighbors[2], [1, -1, -1])
+
+
+def test_cached_mesh_recomputes_initial_oil(monkeypatch):
+    """
+    making sure the mesh cache only keeps the file contents, so a changed initial oil field is used
+    """
+    filename = "src/Simulation/data/simple.msh"
+    assert Mesh(filename).oil.max() > 0  # fills the cache
+    monkeypatch.setattr("src.Simulation.cells.initial_oil", lambda midpoints: np.zeros(len(midpoints)))
+    assert Mesh(filename).oil.max() == 0
+
+
+def test_mesh_loads_without_writable_cache(monkeypatch, tmp_path):
+    """
+    making sure a cache folder that cannot be created does not stop the mesh from loading
+    """
+    blocker = tmp_path / "not_a_folder"
+    blocker.write_text("")
+    monkeypatch.setattr("src.Simulation.cache.CACHE_DIR", str(blocker / "cache"))
+    mesh = Mesh("src/Simulation/data/simple.msh")
+    assert len(mesh.cells()) > 0